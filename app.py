@@ -1,9 +1,20 @@
 # app.py para Streamlit
 import streamlit as st
-import pandas as pd
+import altair as alt
 import numpy as np
 import joblib
+import queue
+import sys
+import threading
+import time
 import warnings
+from types import MappingProxyType
+from sklearn.compose import ColumnTransformer
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
 warnings.filterwarnings("ignore")
 
 # Configuração da página
@@ -20,57 +31,411 @@ Esta aplicação utiliza machine learning para prever o nível de obesidade com
 """)
 
 # Carregar modelo e encoders
-@st.cache_resource
-def load_artifacts():
-    """Carrega o modelo e outros arquivos necessários"""
+def load_artifact(path, mmap_mode=None):
+    """Carrega um arquivo necessário, interrompendo a aplicação em caso de erro"""
     try:
-        model = joblib.load("modelo_obesidade.pkl")
-        label_encoder = joblib.load("label_encoder.pkl")
-        expected_columns = joblib.load("expected_columns.pkl")
-        categories = joblib.load("categories.pkl")
-        return model, label_encoder, expected_columns, categories
+        return joblib.load(path, mmap_mode=mmap_mode)
     except Exception as e:
         st.error(f"Erro ao carregar arquivos: {e}")
-        return None, None, None, None
+        st.stop()
+
+@st.cache_resource
+def get_model():
+    """Carrega o modelo treinado (arrays mapeados do disco, arquivo sem compressão)"""
+    return load_artifact("modelo_obesidade.pkl", mmap_mode="r")
+
+@st.cache_resource
+def get_label_encoder():
+    """Carrega o codificador das classes"""
+    return load_artifact("label_encoder.pkl")
+
+@st.cache_resource
+def get_expected_columns():
+    """Carrega a ordem de colunas esperada pelo modelo"""
+    return tuple(sys.intern(column) for column in load_artifact("expected_columns.pkl"))
+
+@st.cache_resource
+def get_categories():
+    """Carrega as categorias das variáveis ordinais"""
+    return {
+        name: tuple(sys.intern(value) for value in values)
+        for name, values in load_artifact("categories.pkl").items()
+    }
+
+# Codificação direta das entradas (sem DataFrame)
+USE_FAST_ENCODER = True
+
+class FeatureEncoder:
+    """Reproduz o pré-processamento ajustado do pipeline em vetores float32"""
+
+    def __init__(self, preprocessor):
+        self.n_features = max(s.stop for s in preprocessor.output_indices_.values())
+        self.base = np.zeros(self.n_features, dtype=np.float32)
+        self.lookup = {}  # (coluna, categoria) -> (posição, valor)
+        self.categorical_columns = []
+        self.numeric = []  # (coluna, posição, média, escala)
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str) and transformer == "drop":
+                continue
+
+            if not all(isinstance(column, str) for column in columns):
+                raise TypeError(f"Colunas de '{name}' devem ser selecionadas por nome")
+
+            steps = transformer.steps if isinstance(transformer, Pipeline) else [(name, transformer)]
+            # Imputadores não alteram entradas completas, a menos que acrescentem indicadores
+            if not all(isinstance(step, SimpleImputer) and not step.add_indicator for _, step in steps[:-1]):
+                raise TypeError(f"Pré-processamento não suportado em '{name}'")
 
-# Carregar artefatos
-model, label_encoder, expected_columns, categories = load_artifacts()
+            step = steps[-1][1]
+            start = preprocessor.output_indices_[name].start
 
-if model is None:
-    st.stop()
+            if (isinstance(step, OneHotEncoder)
+                    and step.handle_unknown in ("ignore", "infrequent_if_exist")
+                    and all(c is None for c in getattr(step, "infrequent_categories_", None) or ())):
+                drop_idx = step.drop_idx_ if step.drop_idx_ is not None else [None] * len(columns)
+                position = start
+                for column, cats, drop in zip(columns, step.categories_, drop_idx):
+                    self.categorical_columns.append(column)
+                    for i, cat in enumerate(cats):
+                        if drop is not None and i == drop:
+                            continue
+                        self.lookup[(column, cat)] = (position, 1.0)
+                        position += 1
+            elif isinstance(step, OrdinalEncoder) and step.handle_unknown == "use_encoded_value":
+                for offset, (column, cats) in enumerate(zip(columns, step.categories_)):
+                    self.categorical_columns.append(column)
+                    self.base[start + offset] = step.unknown_value
+                    for i, cat in enumerate(cats):
+                        self.lookup[(column, cat)] = (start + offset, float(i))
+            elif isinstance(step, StandardScaler):
+                means = step.mean_ if step.with_mean else np.zeros(len(columns))
+                scales = step.scale_ if step.with_std else np.ones(len(columns))
+                for offset, column in enumerate(columns):
+                    self.numeric.append((column, start + offset, float(means[offset]), float(scales[offset])))
+            else:
+                raise TypeError(f"Transformador não suportado: {type(step).__name__}")
+
+    def transform(self, rows, out):
+        """Preenche as primeiras linhas de out com as amostras codificadas"""
+        out = out[:len(rows)]
+        out[:] = self.base
+        for r, row in enumerate(rows):
+            for column, position, mean, scale in self.numeric:
+                out[r, position] = (float(row[column]) - mean) / scale
+            for column in self.categorical_columns:
+                slot = self.lookup.get((column, row[column]))
+                if slot is not None:
+                    out[r, slot[0]] = slot[1]
+        return out
+
+def build_feature_encoder(model):
+    """Cria o codificador direto, ou None se o pipeline não for suportado"""
+    if not USE_FAST_ENCODER:
+        return None
+    if not (isinstance(model, Pipeline) and len(model.steps) == 2
+            and isinstance(model.steps[0][1], ColumnTransformer)):
+        return None
+    try:
+        return FeatureEncoder(model.steps[0][1])
+    except TypeError:
+        return None
+
+# Árvores compactas com limiares em float32
+USE_COMPACT_TREES = True
+# O layout completo ocupa 2 ** max_depth posições por árvore
+MAX_COMPACT_DEPTH = 10
+
+class CompactGradientBoosting:
+    """Cópia somente-leitura das árvores do GradientBoostingClassifier em arrays float32"""
+
+    def __init__(self, estimator):
+        if not (isinstance(estimator.init_, DummyClassifier) and estimator.init_.strategy == "prior"):
+            raise TypeError("Inicialização do modelo não suportada")
+        if estimator.n_trees_per_iteration_ < 3:
+            raise TypeError("Apenas classificação multiclasse é suportada")
+
+        trees = [regressor.tree_ for regressor in estimator.estimators_.ravel()]
+        self.n_stages, self.n_classes = estimator.estimators_.shape
+        self.n_trees = len(trees)
+        self.max_depth = max(tree.max_depth for tree in trees)
+        if self.max_depth > MAX_COMPACT_DEPTH:
+            raise TypeError("Árvores profundas demais para o layout completo")
+
+        # Cada árvore vira uma árvore binária completa de max_depth níveis: os filhos
+        # do nó i ficam em 2i+1 e 2i+2, dispensando os arrays de filhos
+        self.n_internal = 2 ** self.max_depth - 1
+        self.n_leaves = 2 ** self.max_depth
+        feature = np.zeros((self.n_trees, self.n_internal), dtype=np.intp)
+        threshold = np.full((self.n_trees, self.n_internal), np.inf, dtype=np.float32)
+        value = np.zeros((self.n_trees, self.n_leaves))
+        for i, tree in enumerate(trees):
+            # Arredonda para baixo: x <= limiar32 equivale a x <= limiar64 para x float32
+            tree_threshold = tree.threshold.astype(np.float32)
+            tree_threshold = np.where(tree_threshold > tree.threshold,
+                                      np.nextafter(tree_threshold, np.float32(-np.inf)), tree_threshold)
+            self._fill(tree, tree_threshold, estimator.learning_rate,
+                       feature[i], threshold[i], value[i], 0, 0, 0)
+
+        self.feature = feature.ravel()
+        self.threshold = threshold.ravel()
+        self.value = value.ravel()
+        self._internal_offset = np.arange(self.n_trees) * self.n_internal
+        self._leaf_offset = np.arange(self.n_trees) * self.n_leaves - self.n_internal
+        self.classes_ = estimator.classes_
+        # A inicialização "prior" não depende das entradas
+        self.raw_init = estimator._raw_predict_init(np.zeros((1, estimator.n_features_in_)))[0]
+
+    def _fill(self, tree, tree_threshold, learning_rate, feature, threshold, value, node, position, depth):
+        """Copia o nó node da árvore para a posição position do layout completo"""
+        if tree.children_left[node] == -1:
+            # Folhas rasas: o limiar infinito leva sempre à esquerda, mas a folha
+            # ocupa toda a faixa de posições abaixo dela
+            first = last = position
+            for _ in range(self.max_depth - depth):
+                first, last = 2 * first + 1, 2 * last + 2
+            value[first - self.n_internal:last - self.n_internal + 1] = tree.value[node, 0, 0] * learning_rate
+            return
+        feature[position] = tree.feature[node]
+        threshold[position] = tree_threshold[node]
+        self._fill(tree, tree_threshold, learning_rate, feature, threshold, value,
+                   tree.children_left[node], 2 * position + 1, depth + 1)
+        self._fill(tree, tree_threshold, learning_rate, feature, threshold, value,
+                   tree.children_right[node], 2 * position + 2, depth + 1)
+
+    def decision_function(self, X):
+        """Soma as folhas de todas as árvores para cada amostra"""
+        # Os limiares arredondados só equivalem aos do sklearn para entradas float32
+        if X.dtype != np.float32:
+            raise TypeError(f"Entradas devem ser float32, recebido {X.dtype}")
+        n_samples, n_features = X.shape
+        values = X.ravel()
+        sample_offset = (np.arange(n_samples) * n_features)[:, None]
+        position = np.zeros((n_samples, self.n_trees), dtype=np.intp)
+        # Número fixo de níveis, sem desvios: direita soma 1 ao índice do filho
+        for _ in range(self.max_depth):
+            node = position + self._internal_offset
+            go_right = values.take(self.feature.take(node) + sample_offset) > self.threshold.take(node)
+            position = 2 * position + 1 + go_right
+        leaves = self.value.take(position + self._leaf_offset).reshape(n_samples, self.n_stages, self.n_classes)
+        return self.raw_init + leaves.sum(axis=1)
+
+    def predict_proba(self, X):
+        """Probabilidades por classe (softmax das pontuações)"""
+        raw = self.decision_function(X)
+        exp = np.exp(raw - raw.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+def build_compact_trees(estimator):
+    """Cria a versão compacta das árvores, ou None se o estimador não for suportado"""
+    if not USE_COMPACT_TREES or not isinstance(estimator, GradientBoostingClassifier):
+        return None
+    try:
+        return CompactGradientBoosting(estimator)
+    # AttributeError/ValueError: API privada do sklearn (_raw_predict_init) alterada
+    except (TypeError, AttributeError, ValueError):
+        return None
+
+# Agrupamento de requisições concorrentes
+MAX_BATCH = 32
+MAX_WAIT_MS = 20
+
+class _PendingRequest:
+    """Requisição aguardando o processamento do lote"""
+    __slots__ = ("features", "done", "result", "error")
+
+    def __init__(self, features):
+        self.features = features
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class BatchedPredictor:
+    """Agrupa predições de várias sessões em uma única chamada ao modelo"""
+
+    def __init__(self, model, expected_columns, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.expected_columns = expected_columns
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.encoder = build_feature_encoder(model)
+        if self.encoder is not None:
+            self.estimator = build_compact_trees(model.steps[-1][1]) or model.steps[-1][1]
+            self._buffer = np.zeros((max_batch, self.encoder.n_features), dtype=np.float32)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="batched-predictor", daemon=True)
+        self._worker.start()
+
+    def predict_one(self, input_dict):
+        """Enfileira uma amostra e retorna suas probabilidades por classe"""
+        request = _PendingRequest(input_dict)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self):
+        """Coleta até max_batch requisições ou até max_wait segundos"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        """Executa uma única chamada a predict_proba para o lote inteiro"""
+        rows = [request.features for request in batch]
+        try:
+            if self.encoder is not None:
+                probas = self.estimator.predict_proba(self.encoder.transform(rows, self._buffer))
+            else:
+                import pandas as pd
+                batch_df = pd.DataFrame(rows)[list(self.expected_columns)]
+                probas = self.model.predict_proba(batch_df)
+        except Exception as e:
+            for request in batch:
+                request.error = e
+                request.done.set()
+            return
+
+        for request, proba in zip(batch, probas):
+            request.result = proba
+            request.done.set()
+
+@st.cache_resource
+def get_predictor():
+    """Cria o preditor em lote compartilhado entre as sessões"""
+    return BatchedPredictor(get_model(), get_expected_columns())
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def predict(features):
+    """Predição memorizada para uma tupla de entradas na ordem de expected_columns"""
+    input_dict = dict(zip(get_expected_columns(), features))
+    prediction_proba = get_predictor().predict_one(input_dict)
+    # Equivale a model.predict: as colunas de predict_proba seguem model.classes_
+    prediction = get_model().classes_[np.argmax(prediction_proba)]
+    return int(prediction), tuple(prediction_proba.tolist())
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def to_csv_bytes(features, columns):
+    """Relatório CSV memorizado para uma tupla de entradas"""
+    import pandas as pd
+    return pd.DataFrame([dict(zip(columns, features))]).to_csv(index=False).encode()
+
+# Pré-carregar os artefatos na primeira execução do processo (acertos de cache depois)
+get_model()
+get_label_encoder()
+get_expected_columns()
+get_categories()
+get_predictor()
 
 # Sidebar para entrada de dados
 st.sidebar.header("📊 Informações do Paciente")
 
-# Mapeamento de labels
-obesity_labels = {
-    0: "Insufficient_Weight",
-    1: "Normal_Weight", 
-    2: "Overweight_Level_I",
-    3: "Obesity_Type_I",
-    4: "Obesity_Type_II",
-    5: "Obesity_Type_III"
-}
+# Mapeamento de labels (índice -> classe)
+OBESITY_LABELS = (
+    "Insufficient_Weight",
+    "Normal_Weight",
+    "Overweight_Level_I",
+    "Obesity_Type_I",
+    "Obesity_Type_II",
+    "Obesity_Type_III"
+)
+
+# Tradução das classes para português
+LABEL_TRANSLATION = MappingProxyType({
+    "Insufficient_Weight": "Baixo Peso",
+    "Normal_Weight": "Peso Normal",
+    "Overweight_Level_I": "Sobrepeso Nível I",
+    "Obesity_Type_I": "Obesidade Tipo I",
+    "Obesity_Type_II": "Obesidade Tipo II",
+    "Obesity_Type_III": "Obesidade Tipo III"
+})
+
+# Recomendações por nível de obesidade
+RECOMMENDATIONS = MappingProxyType({
+    "Baixo Peso": """
+    - Aumentar consumo calórico de forma saudável
+    - Incluir proteínas magras e carboidratos complexos
+    - Consultar nutricionista para plano alimentar
+    - Exercícios de força para ganho muscular
+    """,
+    "Peso Normal": """
+    - Manter hábitos alimentares saudáveis
+    - Continuar com atividade física regular
+    - Monitorar peso mensalmente
+    - Manter hidratação adequada
+    """,
+    "Sobrepeso Nível I": """
+    - Reduzir calorias em 200-300 por dia
+    - Aumentar atividade física para 150 min/semana
+    - Reduzir alimentos processados e açúcares
+    - Acompanhar ingestão alimentar
+    """,
+    "Obesidade Tipo I": """
+    - Consultar médico e nutricionista
+    - Redução calórica supervisionada
+    - Exercícios aeróbicos 30 min/dia, 5x/semana
+    - Monitorar progresso semanalmente
+    """,
+    "Obesidade Tipo II": """
+    - Acompanhamento médico obrigatório
+    - Plano alimentar personalizado
+    - Atividade física supervisionada
+    - Considerar acompanhamento psicológico
+    """,
+    "Obesidade Tipo III": """
+    - Intervenção médica imediata
+    - Tratamento multidisciplinar
+    - Possível indicação cirúrgica
+    - Acompanhamento intensivo
+    """
+})
 
 # Funções auxiliares
 def calculate_bmi(weight, height):
     """Calcula o BMI"""
     return weight / (height ** 2)
 
+# Limites das faixas de BMI (cada limite pertence à faixa seguinte)
+_BMI_EDGES = np.array([18.5, 25, 30, 35, 40])
+_BMI_LABELS = (
+    "Baixo peso",
+    "Peso normal",
+    "Sobrepeso Nível I",
+    "Obesidade Tipo I",
+    "Obesidade Tipo II",
+    "Obesidade Tipo III"
+)
+
 def classify_bmi(bmi):
     """Classifica o BMI em categorias"""
-    if bmi < 18.5:
-        return "Baixo peso"
-    elif bmi < 25:
-        return "Peso normal"
-    elif bmi < 30:
-        return "Sobrepeso Nível I"
-    elif bmi < 35:
-        return "Obesidade Tipo I"
-    elif bmi < 40:
-        return "Obesidade Tipo II"
-    else:
-        return "Obesidade Tipo III"
+    return _BMI_LABELS[int(np.searchsorted(_BMI_EDGES, bmi, side="right"))]
+
+def classify_bmi_array(bmis):
+    """Classifica um array de BMIs em categorias"""
+    return np.take(_BMI_LABELS, np.searchsorted(_BMI_EDGES, bmis, side="right"))
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def probability_chart_spec(categories, probabilities):
+    """Monta (uma vez por resultado) a especificação Vega-Lite do gráfico de probabilidades"""
+    chart_data = alt.Data(values=[
+        {"Categoria": category, "Probabilidade (%)": probability}
+        for category, probability in zip(categories, probabilities)
+    ])
+    chart = alt.Chart(chart_data).mark_bar().encode(
+        x=alt.X("Categoria:N", sort=None),
+        y="Probabilidade (%):Q"
+    ).properties(height=250)
+    return chart.to_dict()
 
 # Formulário de entrada
 with st.form("patient_form"):
@@ -87,7 +452,7 @@ with st.form("patient_form"):
     with col2:
         fvc = st.slider("Frequência de consumo de vegetais (1-3)", 1.0, 3.0, 2.0, step=0.1)
         ncp = st.slider("Número de refeições principais (1-4)", 1.0, 4.0, 3.0, step=0.1)
-        caec = st.selectbox("Consumo de alimentos entre refeições", categories["CAEC"])
+        caec = st.selectbox("Consumo de alimentos entre refeições", get_categories()["CAEC"])
         smoke = st.selectbox("Fuma?", ["yes", "no"])
         ch2o = st.slider("Consumo diário de água (L)", 0.5, 3.0, 1.5, step=0.1)
         scc = st.selectbox("Monitora calorias consumidas?", ["yes", "no"])
@@ -99,7 +464,7 @@ with st.form("patient_form"):
         tue = st.slider("Tempo usando dispositivos eletrônicos (0-2)", 0.0, 2.0, 1.0, step=0.1)
     
     with col4:
-        calc = st.selectbox("Consumo de álcool", categories["CALC"])
+        calc = st.selectbox("Consumo de álcool", get_categories()["CALC"])
         mtrans = st.selectbox("Meio de transporte principal", 
                              ["Automobile", "Bike", "Motorbike", "Public_Transportation", "Walking"])
     
@@ -112,8 +477,8 @@ if submitted:
         bmi = calculate_bmi(weight, height)
         bmi_category = classify_bmi(bmi)
         
-        # Criar DataFrame com os dados
-        input_data = pd.DataFrame([{
+        # Dados de entrada
+        input_dict = {
             "Gender": gender,
             "Age": float(age),
             "Height": height,
@@ -130,29 +495,19 @@ if submitted:
             "TUE": float(tue),
             "CALC": calc,
             "MTRANS": mtrans
-        }])
-        
-        # Garantir que as colunas estão na ordem correta
-        input_data = input_data[expected_columns]
+        }
         
-        # Fazer predição
-        prediction = model.predict(input_data)[0]
-        prediction_proba = model.predict_proba(input_data)[0]
+        # Fazer predição (memorizada por entrada e agrupada com outras sessões)
+        features = tuple(input_dict[column] for column in get_expected_columns())
+        prediction, prediction_proba = predict(features)
+        prediction_proba = np.array(prediction_proba)
         
         # Decodificar a predição
+        label_encoder = get_label_encoder()
         prediction_label = label_encoder.inverse_transform([prediction])[0]
         
         # Traduzir para português
-        label_translation = {
-            "Insufficient_Weight": "Baixo Peso",
-            "Normal_Weight": "Peso Normal",
-            "Overweight_Level_I": "Sobrepeso Nível I",
-            "Obesity_Type_I": "Obesidade Tipo I",
-            "Obesity_Type_II": "Obesidade Tipo II",
-            "Obesity_Type_III": "Obesidade Tipo III"
-        }
-        
-        translated_label = label_translation.get(prediction_label, prediction_label)
+        translated_label = LABEL_TRANSLATION.get(prediction_label, prediction_label)
         
         # Exibir resultados
         st.success("✅ Predição concluída!")
@@ -177,61 +532,24 @@ if submitted:
         # Gráfico de probabilidades
         st.subheader("📊 Probabilidades por Categoria")
         
-        prob_df = pd.DataFrame({
-            "Categoria": [label_translation.get(lbl, lbl) for lbl in label_encoder.classes_],
-            "Probabilidade (%)": (prediction_proba * 100).round(1)
-        }).sort_values("Probabilidade (%)", ascending=False)
+        order = np.argsort(-prediction_proba, kind="stable")
+        chart_categories = tuple(
+            LABEL_TRANSLATION.get(label_encoder.classes_[i], str(label_encoder.classes_[i])) for i in order
+        )
+        chart_probabilities = tuple((prediction_proba[order] * 100).round(1).tolist())
         
-        st.bar_chart(prob_df.set_index("Categoria"))
+        chart_spec = probability_chart_spec(chart_categories, chart_probabilities)
+        st.vega_lite_chart(chart_spec, use_container_width=True)
         
         # Recomendações baseadas no resultado
         st.subheader("💡 Recomendações")
         
-        recommendations = {
-            "Baixo Peso": """
-            - Aumentar consumo calórico de forma saudável
-            - Incluir proteínas magras e carboidratos complexos
-            - Consultar nutricionista para plano alimentar
-            - Exercícios de força para ganho muscular
-            """,
-            "Peso Normal": """
-            - Manter hábitos alimentares saudáveis
-            - Continuar com atividade física regular
-            - Monitorar peso mensalmente
-            - Manter hidratação adequada
-            """,
-            "Sobrepeso Nível I": """
-            - Reduzir calorias em 200-300 por dia
-            - Aumentar atividade física para 150 min/semana
-            - Reduzir alimentos processados e açúcares
-            - Acompanhar ingestão alimentar
-            """,
-            "Obesidade Tipo I": """
-            - Consultar médico e nutricionista
-            - Redução calórica supervisionada
-            - Exercícios aeróbicos 30 min/dia, 5x/semana
-            - Monitorar progresso semanalmente
-            """,
-            "Obesidade Tipo II": """
-            - Acompanhamento médico obrigatório
-            - Plano alimentar personalizado
-            - Atividade física supervisionada
-            - Considerar acompanhamento psicológico
-            """,
-            "Obesidade Tipo III": """
-            - Intervenção médica imediata
-            - Tratamento multidisciplinar
-            - Possível indicação cirúrgica
-            - Acompanhamento intensivo
-            """
-        }
-        
-        st.info(recommendations.get(translated_label, "Consulte um profissional de saúde."))
+        st.info(RECOMMENDATIONS.get(translated_label, "Consulte um profissional de saúde."))
         
         # Download dos dados
         st.download_button(
             label="📥 Baixar Relatório",
-            data=input_data.to_csv(index=False),
+            data=to_csv_bytes(features, get_expected_columns()),
             file_name="dados_paciente.csv",
             mime="text/csv"
         )